@@ -6,8 +6,6 @@ Create Date: 2025-07-14 22:00:00.000000
 
 """
 from alembic import op
-import sqlalchemy as sa
-from sqlalchemy.dialects import postgresql
 
 # revision identifiers, used by Alembic.
 revision = '001'
@@ -16,119 +14,139 @@ branch_labels = None
 depends_on = None
 
 
+# Indexes are built with CREATE INDEX CONCURRENTLY so a deploy against a live
+# database does not take a full table lock per index. CONCURRENTLY cannot run
+# inside a transaction block, so the index DDL is issued from an autocommit
+# block after the table DDL commits.
+INDEXES = [
+    # (index_name, table, column SQL, unique)
+    ('idx_users_email_active', 'users', 'email, is_active', False),
+    ('idx_users_username_active', 'users', 'username, is_active', False),
+    ('ix_users_email', 'users', 'email', False),
+    ('ix_users_username', 'users', 'username', False),
+    ('idx_projects_name', 'projects', 'name', False),
+    ('idx_projects_owner_active', 'projects', 'owner_id, is_active', False),
+    ('idx_project_members_project_user', 'project_members', 'project_id, user_id', True),
+    ('idx_project_members_user', 'project_members', 'user_id', False),
+    ('idx_tasks_assignee', 'tasks', 'assignee_id', False),
+    ('idx_tasks_due_date', 'tasks', 'due_date', False),
+    ('idx_tasks_priority', 'tasks', 'priority', False),
+    ('idx_tasks_project_order', 'tasks', 'project_id, order_index', False),
+    ('idx_tasks_project_status', 'tasks', 'project_id, status', False),
+    ('idx_comments_author', 'comments', 'author_id', False),
+    ('idx_comments_task_created', 'comments', 'task_id, created_at', False),
+    ('idx_task_embeddings_hash', 'task_embeddings', 'content_hash', False),
+    ('idx_task_embeddings_qdrant', 'task_embeddings', 'qdrant_point_id', True),
+    ('idx_task_embeddings_task_type', 'task_embeddings', 'task_id, embedding_type', False),
+]
+
+
+TABLES_DDL = """
+CREATE TABLE users (
+    id UUID NOT NULL,
+    email VARCHAR(255) NOT NULL,
+    username VARCHAR(100) NOT NULL,
+    full_name VARCHAR(255),
+    hashed_password VARCHAR(255) NOT NULL,
+    is_active BOOLEAN NOT NULL,
+    is_superuser BOOLEAN NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (id),
+    UNIQUE (email),
+    UNIQUE (username)
+);
+
+CREATE TABLE projects (
+    id UUID NOT NULL,
+    name VARCHAR(255) NOT NULL,
+    description TEXT,
+    owner_id UUID NOT NULL REFERENCES users (id),
+    is_active BOOLEAN NOT NULL,
+    settings JSON,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (id)
+);
+
+CREATE TABLE project_members (
+    id UUID NOT NULL,
+    project_id UUID NOT NULL REFERENCES projects (id),
+    user_id UUID NOT NULL REFERENCES users (id),
+    role VARCHAR(50) NOT NULL,
+    joined_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (id)
+);
+
+CREATE TABLE tasks (
+    id UUID NOT NULL,
+    title VARCHAR(500) NOT NULL,
+    description TEXT,
+    project_id UUID NOT NULL REFERENCES projects (id),
+    assignee_id UUID REFERENCES users (id),
+    status VARCHAR(50) NOT NULL,
+    priority VARCHAR(20) NOT NULL,
+    labels JSON,
+    due_date TIMESTAMPTZ,
+    estimated_hours INTEGER,
+    actual_hours INTEGER,
+    order_index INTEGER NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (id)
+);
+
+CREATE TABLE comments (
+    id UUID NOT NULL,
+    task_id UUID NOT NULL REFERENCES tasks (id),
+    author_id UUID NOT NULL REFERENCES users (id),
+    content TEXT NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (id)
+);
+
+CREATE TABLE task_embeddings (
+    id UUID NOT NULL,
+    task_id UUID NOT NULL REFERENCES tasks (id),
+    embedding_type VARCHAR(50) NOT NULL,
+    qdrant_point_id VARCHAR(255) NOT NULL,
+    content_hash VARCHAR(64) NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (id)
+);
+"""
+
+
 def upgrade() -> None:
-    # Create users table
-    op.create_table('users',
-        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
-        sa.Column('email', sa.String(length=255), nullable=False),
-        sa.Column('username', sa.String(length=100), nullable=False),
-        sa.Column('full_name', sa.String(length=255), nullable=True),
-        sa.Column('hashed_password', sa.String(length=255), nullable=False),
-        sa.Column('is_active', sa.Boolean(), nullable=False),
-        sa.Column('is_superuser', sa.Boolean(), nullable=False),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
-        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
-        sa.PrimaryKeyConstraint('id'),
-        sa.UniqueConstraint('email'),
-        sa.UniqueConstraint('username')
-    )
-    op.create_index('idx_users_email_active', 'users', ['email', 'is_active'], unique=False)
-    op.create_index('idx_users_username_active', 'users', ['username', 'is_active'], unique=False)
-    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=False)
-    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=False)
-
-    # Create projects table
-    op.create_table('projects',
-        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
-        sa.Column('name', sa.String(length=255), nullable=False),
-        sa.Column('description', sa.Text(), nullable=True),
-        sa.Column('owner_id', postgresql.UUID(as_uuid=True), nullable=False),
-        sa.Column('is_active', sa.Boolean(), nullable=False),
-        sa.Column('settings', sa.JSON(), nullable=True),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
-        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
-        sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ),
-        sa.PrimaryKeyConstraint('id')
-    )
-    op.create_index('idx_projects_name', 'projects', ['name'], unique=False)
-    op.create_index('idx_projects_owner_active', 'projects', ['owner_id', 'is_active'], unique=False)
-
-    # Create project_members table
-    op.create_table('project_members',
-        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
-        sa.Column('project_id', postgresql.UUID(as_uuid=True), nullable=False),
-        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
-        sa.Column('role', sa.String(length=50), nullable=False),
-        sa.Column('joined_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
-        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
-        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
-        sa.PrimaryKeyConstraint('id')
-    )
-    op.create_index('idx_project_members_project_user', 'project_members', ['project_id', 'user_id'], unique=True)
-    op.create_index('idx_project_members_user', 'project_members', ['user_id'], unique=False)
-
-    # Create tasks table
-    op.create_table('tasks',
-        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
-        sa.Column('title', sa.String(length=500), nullable=False),
-        sa.Column('description', sa.Text(), nullable=True),
-        sa.Column('project_id', postgresql.UUID(as_uuid=True), nullable=False),
-        sa.Column('assignee_id', postgresql.UUID(as_uuid=True), nullable=True),
-        sa.Column('status', sa.String(length=50), nullable=False),
-        sa.Column('priority', sa.String(length=20), nullable=False),
-        sa.Column('labels', sa.JSON(), nullable=True),
-        sa.Column('due_date', sa.DateTime(timezone=True), nullable=True),
-        sa.Column('estimated_hours', sa.Integer(), nullable=True),
-        sa.Column('actual_hours', sa.Integer(), nullable=True),
-        sa.Column('order_index', sa.Integer(), nullable=False),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
-        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
-        sa.ForeignKeyConstraint(['assignee_id'], ['users.id'], ),
-        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
-        sa.PrimaryKeyConstraint('id')
-    )
-    op.create_index('idx_tasks_assignee', 'tasks', ['assignee_id'], unique=False)
-    op.create_index('idx_tasks_due_date', 'tasks', ['due_date'], unique=False)
-    op.create_index('idx_tasks_priority', 'tasks', ['priority'], unique=False)
-    op.create_index('idx_tasks_project_order', 'tasks', ['project_id', 'order_index'], unique=False)
-    op.create_index('idx_tasks_project_status', 'tasks', ['project_id', 'status'], unique=False)
-
-    # Create comments table
-    op.create_table('comments',
-        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
-        sa.Column('task_id', postgresql.UUID(as_uuid=True), nullable=False),
-        sa.Column('author_id', postgresql.UUID(as_uuid=True), nullable=False),
-        sa.Column('content', sa.Text(), nullable=False),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
-        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
-        sa.ForeignKeyConstraint(['author_id'], ['users.id'], ),
-        sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ),
-        sa.PrimaryKeyConstraint('id')
-    )
-    op.create_index('idx_comments_author', 'comments', ['author_id'], unique=False)
-    op.create_index('idx_comments_task_created', 'comments', ['task_id', 'created_at'], unique=False)
-
-    # Create task_embeddings table
-    op.create_table('task_embeddings',
-        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
-        sa.Column('task_id', postgresql.UUID(as_uuid=True), nullable=False),
-        sa.Column('embedding_type', sa.String(length=50), nullable=False),
-        sa.Column('qdrant_point_id', sa.String(length=255), nullable=False),
-        sa.Column('content_hash', sa.String(length=64), nullable=False),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
-        sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ),
-        sa.PrimaryKeyConstraint('id')
-    )
-    op.create_index('idx_task_embeddings_hash', 'task_embeddings', ['content_hash'], unique=False)
-    op.create_index('idx_task_embeddings_qdrant', 'task_embeddings', ['qdrant_point_id'], unique=True)
-    op.create_index('idx_task_embeddings_task_type', 'task_embeddings', ['task_id', 'embedding_type'], unique=False)
+    # All table DDL goes to the server as one multi-statement string -
+    # a single round trip instead of ~6 through the Alembic/SQLAlchemy/
+    # psycopg2 stack, which matters on high-latency or managed databases
+    op.execute(TABLES_DDL)
+
+    # Build all indexes without blocking concurrent DML. Each CREATE INDEX
+    # CONCURRENTLY must run outside the migration transaction.
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique in INDEXES:
+            unique_sql = 'UNIQUE ' if unique else ''
+            op.execute(
+                f'CREATE {unique_sql}INDEX CONCURRENTLY IF NOT EXISTS '
+                f'{name} ON {table} ({columns})'
+            )
 
 
 def downgrade() -> None:
-    # Drop tables in reverse order
-    op.drop_table('task_embeddings')
-    op.drop_table('comments')
-    op.drop_table('tasks')
-    op.drop_table('project_members')
-    op.drop_table('projects')
-    op.drop_table('users')
\ No newline at end of file
+    # Drop indexes first, without blocking concurrent DML
+    with op.get_context().autocommit_block():
+        for name, _table, _columns, _unique in reversed(INDEXES):
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+    # Drop tables in reverse order, again in one round trip
+    op.execute("""
+        DROP TABLE task_embeddings;
+        DROP TABLE comments;
+        DROP TABLE tasks;
+        DROP TABLE project_members;
+        DROP TABLE projects;
+        DROP TABLE users;
+    """)
\ No newline at end of file
@@ -0,0 +1,39 @@
+"""Add missing single-column foreign-key indexes
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-08-26 10:00:00.000000
+
+Postgres does not index foreign keys automatically, so cascading deletes
+and simple FK-equality lookups fell back to sequential scans. The existing
+composite indexes are kept; a DELETE cascade from users still needs the
+leading-column owner_id/task_id indexes added here.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+FK_INDEXES = [
+    ('idx_projects_owner', 'projects', 'owner_id'),
+    ('idx_tasks_project', 'tasks', 'project_id'),
+    ('idx_comments_task', 'comments', 'task_id'),
+    ('idx_task_embeddings_task', 'task_embeddings', 'task_id'),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, column in FK_INDEXES:
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({column})'
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _table, _column in reversed(FK_INDEXES):
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
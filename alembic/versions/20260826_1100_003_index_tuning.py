@@ -0,0 +1,67 @@
+"""Tune composite indexes for actual query shapes
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-08-26 11:00:00.000000
+
+The users table carried three indexes per lookup column: the implicit
+unique index behind UNIQUE (email) / UNIQUE (username), the non-unique
+ix_users_email / ix_users_username that index=True added on top, and the
+composite idx_users_*_active pair. The unique constraint indexes alone
+answer any equality lookup with a single row (the is_active suffix never
+filtered anything), so the other two sets are write amplification and
+are dropped. idx_tasks_project_status is replaced by a partial index
+matching the hot kanban board query (open tasks of a project in board
+order), and a partial (status, due_date) index covers cross-project
+dashboards.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS idx_users_email_active')
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS idx_users_username_active')
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_users_email')
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_users_username')
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS idx_tasks_project_status')
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_board "
+            "ON tasks (project_id, order_index) WHERE status <> 'done'"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_status_due "
+            "ON tasks (status, due_date) WHERE status IN ('todo', 'in_progress')"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS idx_tasks_status_due')
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS idx_tasks_board')
+        op.execute(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_project_status '
+            'ON tasks (project_id, status)'
+        )
+        op.execute(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_email_active '
+            'ON users (email, is_active)'
+        )
+        op.execute(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_username_active '
+            'ON users (username, is_active)'
+        )
+        op.execute(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_email '
+            'ON users (email)'
+        )
+        op.execute(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_username '
+            'ON users (username)'
+        )
@@ -0,0 +1,53 @@
+"""Convert status-like varchar columns to native PostgreSQL ENUMs
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-08-26 12:00:00.000000
+
+Each enum value is stored as a 4-byte OID instead of a 5-50 byte string
+plus length header, shrinking the heap rows and every index that covers
+these columns, and giving CHECK-style validation for free.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+ENUM_COLUMNS = [
+    # (type name, values, table, column)
+    ('task_status', ('todo', 'in_progress', 'in_review', 'done', 'cancelled'), 'tasks', 'status'),
+    ('task_priority', ('low', 'medium', 'high', 'urgent'), 'tasks', 'priority'),
+    ('member_role', ('owner', 'admin', 'member', 'viewer'), 'project_members', 'role'),
+    ('embedding_type', ('title', 'description', 'full_content'), 'task_embeddings', 'embedding_type'),
+    ('file_type', ('document', 'audio', 'image', 'other'), 'files', 'file_type'),
+]
+
+
+def upgrade() -> None:
+    for type_name, values, table, column in ENUM_COLUMNS:
+        values_sql = ', '.join(f"'{v}'" for v in values)
+        op.execute(f"CREATE TYPE {type_name} AS ENUM ({values_sql})")
+        # files is created outside migrations (Base.metadata.create_all),
+        # so guard the ALTER in case the table does not exist yet
+        op.execute(
+            f"DO $$ BEGIN "
+            f"IF to_regclass('{table}') IS NOT NULL THEN "
+            f"ALTER TABLE {table} ALTER COLUMN {column} "
+            f"TYPE {type_name} USING {column}::{type_name}; "
+            f"END IF; END $$"
+        )
+
+
+def downgrade() -> None:
+    for type_name, _values, table, column in reversed(ENUM_COLUMNS):
+        op.execute(
+            f"DO $$ BEGIN "
+            f"IF to_regclass('{table}') IS NOT NULL THEN "
+            f"ALTER TABLE {table} ALTER COLUMN {column} "
+            f"TYPE varchar(50) USING {column}::text; "
+            f"END IF; END $$"
+        )
+        op.execute(f'DROP TYPE {type_name}')
@@ -0,0 +1,56 @@
+"""Convert json columns to jsonb and index task labels with GIN
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-08-26 13:00:00.000000
+
+jsonb stores a parsed binary form (one parse per write, none per read)
+and supports GIN indexes, so containment queries like
+labels @> '["urgent"]' become index scans instead of sequential scans.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+JSONB_COLUMNS = [
+    ('projects', 'settings'),
+    ('tasks', 'labels'),
+    ('files', 'metadata'),
+]
+
+
+def upgrade() -> None:
+    for table, column in JSONB_COLUMNS:
+        # files is created outside migrations (Base.metadata.create_all),
+        # so guard the ALTER in case the table does not exist yet
+        op.execute(
+            f"DO $$ BEGIN "
+            f"IF to_regclass('{table}') IS NOT NULL THEN "
+            f"ALTER TABLE {table} ALTER COLUMN {column} "
+            f"TYPE jsonb USING {column}::jsonb; "
+            f"END IF; END $$"
+        )
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_labels_gin '
+            'ON tasks USING gin (labels)'
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS idx_tasks_labels_gin')
+
+    for table, column in reversed(JSONB_COLUMNS):
+        op.execute(
+            f"DO $$ BEGIN "
+            f"IF to_regclass('{table}') IS NOT NULL THEN "
+            f"ALTER TABLE {table} ALTER COLUMN {column} "
+            f"TYPE json USING {column}::json; "
+            f"END IF; END $$"
+        )
@@ -0,0 +1,120 @@
+"""Hash-partition comments and task_embeddings by task_id
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-08-26 14:00:00.000000
+
+These become the largest tables and almost every query filters by
+task_id. Hash partitioning keeps each partition's indexes small enough
+to stay in shared_buffers, prunes WHERE task_id = ? scans to a single
+partition, and gives concurrent inserts separate index tails. The
+primary key gains task_id because a partitioned table's PK must contain
+the partition key.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+N_PARTITIONS = 8
+
+
+def _create_partitions(table: str) -> None:
+    for i in range(N_PARTITIONS):
+        op.execute(
+            f'CREATE TABLE {table}_p{i} PARTITION OF {table} '
+            f'FOR VALUES WITH (MODULUS {N_PARTITIONS}, REMAINDER {i})'
+        )
+
+
+def upgrade() -> None:
+    # comments
+    op.execute('ALTER TABLE comments RENAME TO comments_old')
+    op.execute('ALTER INDEX IF EXISTS idx_comments_task RENAME TO idx_comments_task_old')
+    op.execute('ALTER INDEX IF EXISTS idx_comments_task_created RENAME TO idx_comments_task_created_old')
+    op.execute('ALTER INDEX IF EXISTS idx_comments_author RENAME TO idx_comments_author_old')
+    op.execute("""
+        CREATE TABLE comments (
+            id UUID NOT NULL,
+            task_id UUID NOT NULL REFERENCES tasks (id),
+            author_id UUID NOT NULL REFERENCES users (id),
+            content TEXT NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, task_id)
+        ) PARTITION BY HASH (task_id)
+    """)
+    _create_partitions('comments')
+    op.execute('INSERT INTO comments SELECT * FROM comments_old')
+    op.execute('DROP TABLE comments_old')
+    op.execute('CREATE INDEX idx_comments_task ON comments (task_id)')
+    op.execute('CREATE INDEX idx_comments_task_created ON comments (task_id, created_at)')
+    op.execute('CREATE INDEX idx_comments_author ON comments (author_id)')
+
+    # task_embeddings
+    op.execute('ALTER TABLE task_embeddings RENAME TO task_embeddings_old')
+    op.execute('ALTER INDEX IF EXISTS idx_task_embeddings_task RENAME TO idx_task_embeddings_task_old')
+    op.execute('ALTER INDEX IF EXISTS idx_task_embeddings_task_type RENAME TO idx_task_embeddings_task_type_old')
+    op.execute('ALTER INDEX IF EXISTS idx_task_embeddings_qdrant RENAME TO idx_task_embeddings_qdrant_old')
+    op.execute('ALTER INDEX IF EXISTS idx_task_embeddings_hash RENAME TO idx_task_embeddings_hash_old')
+    op.execute("""
+        CREATE TABLE task_embeddings (
+            id UUID NOT NULL,
+            task_id UUID NOT NULL REFERENCES tasks (id),
+            embedding_type embedding_type NOT NULL,
+            qdrant_point_id VARCHAR(255) NOT NULL,
+            content_hash VARCHAR(64) NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, task_id)
+        ) PARTITION BY HASH (task_id)
+    """)
+    _create_partitions('task_embeddings')
+    op.execute('INSERT INTO task_embeddings SELECT * FROM task_embeddings_old')
+    op.execute('DROP TABLE task_embeddings_old')
+    op.execute('CREATE INDEX idx_task_embeddings_task ON task_embeddings (task_id)')
+    op.execute('CREATE INDEX idx_task_embeddings_task_type ON task_embeddings (task_id, embedding_type)')
+    # uniqueness on a partitioned table must include the partition key, so
+    # qdrant_point_id uniqueness is only enforced per task here
+    op.execute('CREATE UNIQUE INDEX idx_task_embeddings_qdrant ON task_embeddings (qdrant_point_id, task_id)')
+    op.execute('CREATE INDEX idx_task_embeddings_hash ON task_embeddings (content_hash)')
+
+
+def downgrade() -> None:
+    for table in ('task_embeddings', 'comments'):
+        op.execute(f'ALTER TABLE {table} RENAME TO {table}_partitioned')
+
+    op.execute("""
+        CREATE TABLE comments (
+            id UUID PRIMARY KEY,
+            task_id UUID NOT NULL REFERENCES tasks (id),
+            author_id UUID NOT NULL REFERENCES users (id),
+            content TEXT NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+    """)
+    op.execute('INSERT INTO comments SELECT * FROM comments_partitioned')
+    op.execute('DROP TABLE comments_partitioned')
+    op.execute('CREATE INDEX idx_comments_task ON comments (task_id)')
+    op.execute('CREATE INDEX idx_comments_task_created ON comments (task_id, created_at)')
+    op.execute('CREATE INDEX idx_comments_author ON comments (author_id)')
+
+    op.execute("""
+        CREATE TABLE task_embeddings (
+            id UUID PRIMARY KEY,
+            task_id UUID NOT NULL REFERENCES tasks (id),
+            embedding_type embedding_type NOT NULL,
+            qdrant_point_id VARCHAR(255) NOT NULL,
+            content_hash VARCHAR(64) NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+    """)
+    op.execute('INSERT INTO task_embeddings SELECT * FROM task_embeddings_partitioned')
+    op.execute('DROP TABLE task_embeddings_partitioned')
+    op.execute('CREATE INDEX idx_task_embeddings_task ON task_embeddings (task_id)')
+    op.execute('CREATE INDEX idx_task_embeddings_task_type ON task_embeddings (task_id, embedding_type)')
+    op.execute('CREATE UNIQUE INDEX idx_task_embeddings_qdrant ON task_embeddings (qdrant_point_id)')
+    op.execute('CREATE INDEX idx_task_embeddings_hash ON task_embeddings (content_hash)')
@@ -1,17 +1,23 @@
 import os
+import asyncio
 import uuid
 import hashlib
 import mimetypes
+import mmap
+import itertools
 from typing import Optional, List, Dict, Any
 from pathlib import Path
 import aiofiles
 import magic
-from sqlalchemy.orm import Session
+from psycopg2.extras import execute_values
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 from fastapi import UploadFile, HTTPException
 from secure_filename import secure_filename
 
 from .models import File, User, Project, Task
-from .database import get_db
+from .database import get_db, get_async_db, AsyncSessionLocal
 from .text_extraction import TextExtractor
 from .audio_processing import AudioProcessor
 
@@ -31,15 +37,48 @@ class FileService:
             'other': ['.zip', '.json', '.xml']
         }
         
+        # Precomputed lookup tables so per-request validation is O(1)
+        # instead of re-flattening allowed_extensions on every call
+        self._ext_to_type = {
+            ext: file_type
+            for file_type, exts in self.allowed_extensions.items()
+            for ext in exts
+        }
+        self._all_allowed = frozenset(self._ext_to_type)
+
+        # Unambiguous extension -> MIME fast path; libmagic only runs for
+        # extensions this table cannot resolve
+        self.ext_to_mime = {
+            '.pdf': 'application/pdf',
+            '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+            '.txt': 'text/plain',
+            '.csv': 'text/csv',
+            '.md': 'text/markdown',
+            '.mp3': 'audio/mpeg',
+            '.wav': 'audio/x-wav',
+            '.m4a': 'audio/mp4',
+            '.jpg': 'image/jpeg',
+            '.jpeg': 'image/jpeg',
+            '.png': 'image/png',
+            '.gif': 'image/gif',
+            '.json': 'application/json',
+            '.xml': 'application/xml',
+        }
+
         self.max_file_size = 50 * 1024 * 1024  # 50MB
+
+        # Bound concurrent thread offloads so upload bursts don't exhaust
+        # the worker-thread pool
+        self._io_semaphore = asyncio.Semaphore((os.cpu_count() or 2) * 2)
+
+        # Keep references to in-flight background processing tasks so the
+        # event loop doesn't garbage-collect them mid-run
+        self._background_tasks: set = set()
         
     def get_file_type(self, filename: str) -> str:
         """Determine file type category based on extension."""
         ext = Path(filename).suffix.lower()
-        for file_type, extensions in self.allowed_extensions.items():
-            if ext in extensions:
-                return file_type
-        return 'other'
+        return self._ext_to_type.get(ext, 'other')
     
     def validate_file(self, file: UploadFile) -> Dict[str, Any]:
         """Validate uploaded file for security and size constraints."""
@@ -62,14 +101,10 @@ class FileService:
         file_type = self.get_file_type(secure_name)
         ext = Path(secure_name).suffix.lower()
         
-        all_allowed = []
-        for extensions in self.allowed_extensions.values():
-            all_allowed.extend(extensions)
-        
-        if ext not in all_allowed:
+        if ext not in self._all_allowed:
             raise HTTPException(
-                status_code=415, 
-                detail=f"File type not allowed. Supported: {', '.join(all_allowed)}"
+                status_code=415,
+                detail=f"File type not allowed. Supported: {', '.join(sorted(self._all_allowed))}"
             )
         
         return {
@@ -78,49 +113,101 @@ class FileService:
             'extension': ext
         }
     
-    async def save_file(self, file: UploadFile) -> str:
-        """Save uploaded file to disk and return file path."""
+    async def save_file(self, file: UploadFile) -> tuple[str, str, int, bytes]:
+        """Stream uploaded file to disk, hashing and sizing it in one pass.
+
+        Returns (file_path, sha256_hex, file_size, header) where header is
+        the first 4KB of the file for MIME detection.
+        """
         unique_filename = f"{uuid.uuid4()}{Path(file.filename).suffix}"
         file_path = self.upload_dir / unique_filename
-        
+
+        # Fast path: large uploads arrive as a SpooledTemporaryFile already
+        # rolled over to disk, so the kernel can move the bytes without
+        # crossing userspace; hash afterwards from the (page-cache-hot) copy
+        spooled = getattr(file, 'file', None)
+        if getattr(spooled, '_rolled', False) and hasattr(os, 'copy_file_range'):
+            total_size = await asyncio.to_thread(
+                self._copy_spooled, spooled.fileno(), str(file_path)
+            )
+            file_hash = await asyncio.to_thread(
+                self._calculate_file_hash, str(file_path)
+            )
+            async with aiofiles.open(file_path, 'rb') as f:
+                header = await f.read(4096)
+            return str(file_path), file_hash, total_size, header
+
+        hasher = hashlib.sha256()
+        total_size = 0
+        header = b''
+
         async with aiofiles.open(file_path, 'wb') as f:
-            content = await file.read()
-            await f.write(content)
-        
-        return str(file_path)
-    
-    def get_file_metadata(self, file_path: str) -> Dict[str, Any]:
-        """Extract file metadata using python-magic."""
+            while chunk := await file.read(1024 * 1024):
+                if not header:
+                    header = chunk[:4096]
+                hasher.update(chunk)
+                total_size += len(chunk)
+                await f.write(chunk)
+
+        return str(file_path), hasher.hexdigest(), total_size, header
+
+    def _copy_spooled(self, src_fd: int, dest_path: str) -> int:
+        """Copy a rolled-over spooled upload with os.copy_file_range."""
+        total = 0
+        os.lseek(src_fd, 0, os.SEEK_SET)
+        with open(dest_path, 'wb') as out:
+            while copied := os.copy_file_range(src_fd, out.fileno(), 1 << 30):
+                total += copied
+        return total
+
+    def get_file_metadata(
+        self,
+        file_hash: str,
+        file_size: int,
+        header: bytes,
+        extension: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Build file metadata from values captured while streaming to disk."""
         try:
-            mime_type = magic.from_file(file_path, mime=True)
-            file_size = os.path.getsize(file_path)
-            
+            mime_type = self.ext_to_mime.get(extension) if extension else None
+            if not mime_type:
+                mime_type = magic.from_buffer(header, mime=True)
+
             return {
                 'mime_type': mime_type,
                 'file_size': file_size,
-                'hash': self._calculate_file_hash(file_path)
+                'hash': file_hash
             }
         except Exception as e:
             return {
                 'mime_type': 'application/octet-stream',
-                'file_size': os.path.getsize(file_path) if os.path.exists(file_path) else 0,
-                'hash': None,
+                'file_size': file_size,
+                'hash': file_hash,
                 'error': str(e)
             }
     
     def _calculate_file_hash(self, file_path: str) -> str:
         """Calculate SHA256 hash of file."""
-        hash_sha256 = hashlib.sha256()
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_sha256.update(chunk)
-        return hash_sha256.hexdigest()
+            if hasattr(hashlib, "file_digest"):  # Python 3.11+: hashes in C, releases the GIL
+                return hashlib.file_digest(f, "sha256").hexdigest()
+
+            hash_sha256 = hashlib.sha256()
+            try:
+                # Map the file so the C hash implementation drives the loop
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    hash_sha256.update(memoryview(mm))
+            except (ValueError, OSError):
+                # Empty file or mmap unavailable - fall back to chunked reads
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    hash_sha256.update(chunk)
+            return hash_sha256.hexdigest()
     
     async def upload_file(
         self,
         file: UploadFile,
         uploaded_by: str,
-        db: Session,
+        db: AsyncSession,
         project_id: Optional[str] = None,
         task_id: Optional[str] = None
     ) -> File:
@@ -129,13 +216,31 @@ class FileService:
         # Validate file
         validation_result = self.validate_file(file)
         
-        # Save file to disk
-        file_path = await self.save_file(file)
-        
+        # Save file to disk, hashing and sizing while streaming.
+        # new_file_path tracks the copy written by this request; it is the
+        # only path the error handler may unlink.
+        new_file_path, file_hash, file_size, header = await self.save_file(file)
+        file_path = new_file_path
+
         try:
-            # Get file metadata
-            metadata = self.get_file_metadata(file_path)
+            # Get file metadata off the event loop - libmagic is blocking
+            async with self._io_semaphore:
+                metadata = await asyncio.to_thread(
+                    self.get_file_metadata, file_hash, file_size, header,
+                    validation_result['extension']
+                )
             
+            # Deduplicate by content: if this exact file is already stored,
+            # drop the new copy, point at the existing one and reuse its
+            # extraction instead of processing it again
+            duplicate = (await db.execute(
+                select(File).where(File.content_hash == file_hash)
+            )).scalars().first()
+            if duplicate:
+                os.remove(new_file_path)
+                new_file_path = None
+                file_path = duplicate.file_path
+
             # Create file record
             file_record = File(
                 filename=validation_result['secure_filename'],
@@ -144,119 +249,214 @@ class FileService:
                 file_size=metadata['file_size'],
                 mime_type=metadata['mime_type'],
                 file_type=validation_result['file_type'],
+                content_hash=file_hash,
                 uploaded_by=uploaded_by,
                 project_id=project_id,
                 task_id=task_id,
                 metadata=metadata,
-                processing_status="pending"
+                extracted_text=duplicate.extracted_text if duplicate else None,
+                # Mirror the duplicate's status rather than assuming it
+                # finished: its extraction may still be running or have failed
+                processing_status=(
+                    duplicate.processing_status if duplicate else "pending"
+                )
             )
-            
+
             db.add(file_record)
-            db.commit()
-            db.refresh(file_record)
-            
-            # Process file asynchronously
-            await self.process_file(file_record, db)
-            
+            await db.commit()
+            await db.refresh(file_record)
+
+            if not duplicate or duplicate.processing_status == "failed":
+                # Process file out-of-band; the client polls
+                # processing_status (pending -> processing -> completed/failed)
+                task = asyncio.create_task(
+                    self._process_file_background(str(file_record.id))
+                )
+                self._background_tasks.add(task)
+                task.add_done_callback(self._background_tasks.discard)
+
             return file_record
             
         except Exception as e:
-            # Clean up file if database operation fails
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            # Clean up the copy written by this request if the database
+            # operation fails; a deduplicated path belongs to earlier rows
+            if new_file_path and os.path.exists(new_file_path):
+                os.remove(new_file_path)
             raise HTTPException(status_code=500, detail=f"File upload failed: {str(e)}")
     
-    async def process_file(self, file_record: File, db: Session):
+    async def _process_file_background(self, file_id: str):
+        """Run process_file on its own session, outside the request cycle."""
+        async with AsyncSessionLocal() as db:
+            file_record = await self.get_file(file_id, db)
+            if file_record:
+                await self.process_file(file_record, db)
+
+    async def process_file(self, file_record: File, db: AsyncSession):
         """Process uploaded file for text extraction or audio processing."""
         try:
             file_record.processing_status = "processing"
-            db.commit()
-            
+            await db.commit()
+
             extracted_text = None
-            
+
             if file_record.file_type == "document":
                 extracted_text = await self.text_extractor.extract_text(
-                    file_record.file_path, 
+                    file_record.file_path,
                     file_record.mime_type
                 )
             elif file_record.file_type == "audio":
                 # For audio files, we might want to extract metadata or prepare for transcription
                 audio_metadata = await self.audio_processor.get_metadata(file_record.file_path)
                 file_record.metadata = {**file_record.metadata, **audio_metadata}
-            
+
             if extracted_text:
                 file_record.extracted_text = extracted_text
-            
+
             file_record.processing_status = "completed"
-            db.commit()
-            
+            await db.commit()
+
         except Exception as e:
             file_record.processing_status = "failed"
             file_record.metadata = {
-                **file_record.metadata, 
+                **file_record.metadata,
                 'processing_error': str(e)
             }
-            db.commit()
+            await db.commit()
     
-    def get_file(self, file_id: str, db: Session) -> Optional[File]:
+    def bulk_register(
+        self,
+        db: Session,
+        records: List[Dict[str, Any]],
+        chunk_size: int = 1000
+    ) -> int:
+        """Insert many file records using multi-row INSERTs.
+
+        records are plain dicts of File column values. Core inserts skip
+        the per-instance ORM flush machinery, so backfills and imports run
+        roughly an order of magnitude faster than add()/commit() per row.
+        """
+        total = 0
+        for i in range(0, len(records), chunk_size):
+            chunk = records[i:i + chunk_size]
+            db.execute(File.__table__.insert(), chunk)
+            total += len(chunk)
+
+        db.commit()
+        return total
+
+    async def get_file(self, file_id: str, db: AsyncSession) -> Optional[File]:
         """Retrieve file record by ID."""
-        return db.query(File).filter(File.id == file_id).first()
+        result = await db.execute(
+            select(File).options(
+                selectinload(File.project),
+                selectinload(File.task)
+            ).where(File.id == file_id)
+        )
+        return result.scalars().first()
     
-    def list_files(
+    async def list_files(
         self,
-        db: Session,
+        db: AsyncSession,
         project_id: Optional[str] = None,
         task_id: Optional[str] = None,
         file_type: Optional[str] = None,
         uploaded_by: Optional[str] = None,
         limit: int = 50,
-        offset: int = 0
-    ) -> List[File]:
-        """List files with optional filters."""
-        query = db.query(File)
-        
+        cursor: Optional[tuple] = None
+    ) -> tuple[List[File], Optional[tuple]]:
+        """List files with optional filters, paginated by keyset.
+
+        cursor is the (created_at, id) pair returned with the previous
+        page; passing it back continues from there in O(log N) instead of
+        the O(offset) scan-and-discard that OFFSET pagination costs.
+        Returns (files, next_cursor); next_cursor is None on the last page.
+        """
+        # Eager-load relationships with selectin so rendering a page costs
+        # a fixed number of queries instead of one per row
+        query = select(File).options(
+            selectinload(File.project),
+            selectinload(File.task),
+            selectinload(File.uploader)
+        )
+
         if project_id:
-            query = query.filter(File.project_id == project_id)
+            query = query.where(File.project_id == project_id)
         if task_id:
-            query = query.filter(File.task_id == task_id)
+            query = query.where(File.task_id == task_id)
         if file_type:
-            query = query.filter(File.file_type == file_type)
+            query = query.where(File.file_type == file_type)
         if uploaded_by:
-            query = query.filter(File.uploaded_by == uploaded_by)
-        
-        return query.order_by(File.created_at.desc()).offset(offset).limit(limit).all()
-    
-    def delete_file(self, file_id: str, db: Session) -> bool:
+            query = query.where(File.uploaded_by == uploaded_by)
+        if cursor:
+            query = query.where(tuple_(File.created_at, File.id) < cursor)
+
+        query = query.order_by(
+            File.created_at.desc(), File.id.desc()
+        ).limit(limit)
+
+        files = list((await db.execute(query)).scalars().all())
+
+        next_cursor = None
+        if len(files) == limit:
+            next_cursor = (files[-1].created_at, files[-1].id)
+
+        return files, next_cursor
+
+    async def delete_file(self, file_id: str, db: AsyncSession) -> bool:
         """Delete file record and physical file."""
-        file_record = self.get_file(file_id, db)
+        file_record = await self.get_file(file_id, db)
         if not file_record:
             return False
-        
-        # Delete physical file
-        if os.path.exists(file_record.file_path):
+
+        # Delete physical file, unless deduplicated rows still reference it
+        still_referenced = (await db.execute(
+            select(File.id).where(
+                File.file_path == file_record.file_path,
+                File.id != file_record.id
+            )
+        )).first()
+        if not still_referenced and os.path.exists(file_record.file_path):
             os.remove(file_record.file_path)
-        
+
         # Delete database record
-        db.delete(file_record)
-        db.commit()
-        
+        await db.delete(file_record)
+        await db.commit()
+
         return True
     
     def cleanup_orphaned_files(self, db: Session) -> int:
         """Clean up files that exist on disk but not in database."""
-        db_files = {f.file_path for f in db.query(File).all()}
-        disk_files = set()
-        
-        for file_path in self.upload_dir.rglob('*'):
-            if file_path.is_file():
-                disk_files.add(str(file_path))
-        
-        orphaned_files = disk_files - db_files
-        
+        # Push disk paths into a temp table and let Postgres compute the
+        # anti-join server-side instead of pulling every file_path over the
+        # wire into a Python set
+        disk_paths = (str(p) for p in self.upload_dir.rglob('*') if p.is_file())
+
+        cursor = db.connection().connection.cursor()
+        cursor.execute(
+            "CREATE TEMP TABLE tmp_disk_paths (path text PRIMARY KEY) ON COMMIT DROP"
+        )
+
+        while batch := list(itertools.islice(disk_paths, 10_000)):
+            execute_values(
+                cursor,
+                "INSERT INTO tmp_disk_paths (path) VALUES %s ON CONFLICT DO NOTHING",
+                [(path,) for path in batch]
+            )
+
+        cursor.execute(
+            "SELECT d.path FROM tmp_disk_paths d "
+            "LEFT JOIN files f ON f.file_path = d.path "
+            "WHERE f.id IS NULL"
+        )
+        orphaned_files = [row[0] for row in cursor.fetchall()]
+        db.commit()  # ends the transaction, dropping the temp table
+
+        removed = 0
         for file_path in orphaned_files:
             try:
                 os.remove(file_path)
+                removed += 1
             except OSError:
                 pass
-        
-        return len(orphaned_files)
\ No newline at end of file
+
+        return removed
\ No newline at end of file
@@ -1,17 +1,53 @@
-from sqlalchemy import Column, String, Text, DateTime, Boolean, Integer, ForeignKey, JSON, Index
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Text, DateTime, Boolean, Integer, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import UUID, ENUM, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+import os
+import time
 import uuid
 from app.database import Base
 
+# Native PostgreSQL enum types; created by migration 004, so SQLAlchemy
+# must not try to emit CREATE TYPE itself (create_type=False)
+TaskStatus = ENUM('todo', 'in_progress', 'in_review', 'done', 'cancelled',
+                  name='task_status', create_type=False)
+TaskPriority = ENUM('low', 'medium', 'high', 'urgent',
+                    name='task_priority', create_type=False)
+MemberRole = ENUM('owner', 'admin', 'member', 'viewer',
+                  name='member_role', create_type=False)
+EmbeddingType = ENUM('title', 'description', 'full_content',
+                     name='embedding_type', create_type=False)
+FileType = ENUM('document', 'audio', 'image', 'other',
+                name='file_type', create_type=False)
+
+
+def uuid7() -> uuid.UUID:
+    """Generate a time-ordered UUID (UUIDv7 layout).
+
+    The millisecond timestamp prefix keeps new primary keys appending to
+    the rightmost btree leaf instead of scattering random writes across
+    the index - the locality of a bigserial while staying globally unique.
+    """
+    ts_ms = time.time_ns() // 1_000_000
+    rand_a = int.from_bytes(os.urandom(2), 'big') & 0x0FFF
+    rand_b = int.from_bytes(os.urandom(8), 'big') & ((1 << 62) - 1)
+
+    value = (ts_ms & 0xFFFFFFFFFFFF) << 80
+    value |= 0x7 << 76          # version 7
+    value |= rand_a << 64
+    value |= 0x2 << 62          # RFC 4122 variant
+    value |= rand_b
+    return uuid.UUID(int=value)
+
 
 class User(Base):
     __tablename__ = "users"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    email = Column(String(255), unique=True, nullable=False, index=True)
-    username = Column(String(100), unique=True, nullable=False, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    # unique=True already backs each column with a unique index; an extra
+    # index=True would duplicate it and double the write amplification
+    email = Column(String(255), unique=True, nullable=False)
+    username = Column(String(100), unique=True, nullable=False)
     full_name = Column(String(255), nullable=True)
     hashed_password = Column(String(255), nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
@@ -24,22 +60,17 @@ class User(Base):
     project_members = relationship("ProjectMember", back_populates="user")
     tasks_assigned = relationship("Task", back_populates="assignee")
     comments = relationship("Comment", back_populates="author")
-    
-    __table_args__ = (
-        Index('idx_users_email_active', 'email', 'is_active'),
-        Index('idx_users_username_active', 'username', 'is_active'),
-    )
 
 
 class Project(Base):
     __tablename__ = "projects"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     owner_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
-    settings = Column(JSON, nullable=True)
+    settings = Column(JSONB, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     
@@ -49,6 +80,7 @@ class Project(Base):
     tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan")
     
     __table_args__ = (
+        Index('idx_projects_owner', 'owner_id'),
         Index('idx_projects_owner_active', 'owner_id', 'is_active'),
         Index('idx_projects_name', 'name'),
     )
@@ -57,10 +89,10 @@ class Project(Base):
 class ProjectMember(Base):
     __tablename__ = "project_members"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"), nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    role = Column(String(50), nullable=False, default="member")  # owner, admin, member, viewer
+    role = Column(MemberRole, nullable=False, default="member")
     joined_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     # Relationships
@@ -76,14 +108,14 @@ class ProjectMember(Base):
 class Task(Base):
     __tablename__ = "tasks"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     title = Column(String(500), nullable=False)
     description = Column(Text, nullable=True)
     project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"), nullable=False)
     assignee_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
-    status = Column(String(50), nullable=False, default="todo")  # todo, in_progress, in_review, done, cancelled
-    priority = Column(String(20), nullable=False, default="medium")  # low, medium, high, urgent
-    labels = Column(JSON, nullable=True)  # Array of label strings
+    status = Column(TaskStatus, nullable=False, default="todo")
+    priority = Column(TaskPriority, nullable=False, default="medium")
+    labels = Column(JSONB, nullable=True)  # Array of label strings
     due_date = Column(DateTime(timezone=True), nullable=True)
     estimated_hours = Column(Integer, nullable=True)
     actual_hours = Column(Integer, nullable=True)
@@ -98,18 +130,23 @@ class Task(Base):
     embeddings = relationship("TaskEmbedding", back_populates="task", cascade="all, delete-orphan")
     
     __table_args__ = (
-        Index('idx_tasks_project_status', 'project_id', 'status'),
+        Index('idx_tasks_project', 'project_id'),
+        Index('idx_tasks_board', 'project_id', 'order_index',
+              postgresql_where=text("status <> 'done'")),
+        Index('idx_tasks_status_due', 'status', 'due_date',
+              postgresql_where=text("status IN ('todo', 'in_progress')")),
         Index('idx_tasks_assignee', 'assignee_id'),
         Index('idx_tasks_project_order', 'project_id', 'order_index'),
         Index('idx_tasks_due_date', 'due_date'),
         Index('idx_tasks_priority', 'priority'),
+        Index('idx_tasks_labels_gin', 'labels', postgresql_using='gin'),
     )
 
 
 class Comment(Base):
     __tablename__ = "comments"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id"), nullable=False)
     author_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     content = Column(Text, nullable=False)
@@ -121,6 +158,7 @@ class Comment(Base):
     author = relationship("User", back_populates="comments")
     
     __table_args__ = (
+        Index('idx_comments_task', 'task_id'),
         Index('idx_comments_task_created', 'task_id', 'created_at'),
         Index('idx_comments_author', 'author_id'),
     )
@@ -129,9 +167,9 @@ class Comment(Base):
 class TaskEmbedding(Base):
     __tablename__ = "task_embeddings"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id"), nullable=False)
-    embedding_type = Column(String(50), nullable=False)  # title, description, full_content
+    embedding_type = Column(EmbeddingType, nullable=False)
     qdrant_point_id = Column(String(255), nullable=False)
     content_hash = Column(String(64), nullable=False)  # SHA256 hash of the content
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -140,6 +178,7 @@ class TaskEmbedding(Base):
     task = relationship("Task", back_populates="embeddings")
     
     __table_args__ = (
+        Index('idx_task_embeddings_task', 'task_id'),
         Index('idx_task_embeddings_task_type', 'task_id', 'embedding_type'),
         Index('idx_task_embeddings_qdrant', 'qdrant_point_id', unique=True),
         Index('idx_task_embeddings_hash', 'content_hash'),
@@ -149,18 +188,19 @@ class TaskEmbedding(Base):
 class File(Base):
     __tablename__ = "files"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     filename = Column(String(255), nullable=False)
     original_filename = Column(String(255), nullable=False)
     file_path = Column(String(500), nullable=False)
     file_size = Column(Integer, nullable=False)
     mime_type = Column(String(100), nullable=False)
-    file_type = Column(String(50), nullable=False)  # document, audio, image, other
+    file_type = Column(FileType, nullable=False)
+    content_hash = Column(String(64), nullable=True)  # SHA256 of file contents
     uploaded_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"), nullable=True)
     task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id"), nullable=True)
     extracted_text = Column(Text, nullable=True)
-    metadata = Column(JSON, nullable=True)
+    metadata = Column(JSONB, nullable=True)
     processing_status = Column(String(50), nullable=False, default="pending")  # pending, processing, completed, failed
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -176,4 +216,8 @@ class File(Base):
         Index('idx_files_task', 'task_id'),
         Index('idx_files_type_status', 'file_type', 'processing_status'),
         Index('idx_files_created', 'created_at'),
+        # Backing index for keyset pagination; Postgres scans it backwards
+        # for the (created_at DESC, id DESC) ordering
+        Index('idx_files_created_id', 'created_at', 'id'),
+        Index('idx_files_content_hash', 'content_hash'),
     )
\ No newline at end of file
@@ -1,8 +1,15 @@
-from qdrant_client import QdrantClient
+from qdrant_client import AsyncQdrantClient
 from qdrant_client.models import Distance, VectorParams, CreateCollection, PointStruct
 from qdrant_client.http import models
+import asyncio
+import functools
+import hashlib
+import math
 import os
-from typing import List, Dict, Any
+from array import array
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import List, Dict, Any, NamedTuple, Optional
 from dotenv import load_dotenv
 import logging
 
@@ -10,165 +17,452 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+
+class Hit(NamedTuple):
+    """One search result.
+
+    Tuple-backed instead of a per-hit dict: no hash-map allocation in the
+    result loop, and callers unpack it positionally or by attribute.
+    """
+    id: Any
+    score: float
+    payload: Optional[Dict[str, Any]]
+
+
+def l2_normalize(vector: List[float]) -> List[float]:
+    """Scale a vector to unit length.
+
+    Collections use dot-product distance, which equals cosine similarity
+    for unit vectors but skips the per-query normalization work server-side.
+    upsert_points and search_similar apply it at the boundary, so every
+    vector entering or querying a collection is unit length.
+    """
+    norm = math.sqrt(sum(x * x for x in vector))
+    if norm == 0.0:
+        return list(vector)
+    return [x / norm for x in vector]
+
 class VibeQdrantClient:
     def __init__(self):
         self.host = os.getenv("QDRANT_HOST", "localhost")
         self.port = int(os.getenv("QDRANT_PORT", "6333"))
         self.api_key = os.getenv("QDRANT_API_KEY")
         
-        self.client = QdrantClient(
+        # Async client: searches and upserts are true coroutines instead of
+        # blocking calls hopping through a thread pool.
+        self.client = AsyncQdrantClient(
             host=self.host,
             port=self.port,
             api_key=self.api_key,
-            timeout=30.0
+            timeout=30.0,
+            prefer_grpc=True
         )
         
         # Collection configuration
         self.collections = {
             "task_embeddings": {
                 "vector_size": 384,  # sentence-transformers/all-MiniLM-L6-v2
-                "distance": Distance.COSINE,
+                "distance": Distance.DOT,
                 "description": "Task content embeddings for semantic search"
             },
             "task_titles": {
                 "vector_size": 384,
-                "distance": Distance.COSINE,
+                "distance": Distance.DOT,
                 "description": "Task title embeddings for quick title matching"
             },
             "project_context": {
                 "vector_size": 384,
-                "distance": Distance.COSINE,
+                "distance": Distance.DOT,
                 "description": "Project-level context embeddings"
             }
         }
-    
-    def create_collections(self) -> bool:
-        """Create all required Qdrant collections"""
+
+        # Collections known to exist, so steady-state calls skip the
+        # listing round trip to Qdrant
+        self._known_collections: set = set()
+
+        # Small LRU in front of search_similar: repeated identical queries
+        # (same user refining the same lookup) answer from memory instead
+        # of a round trip to Qdrant. Writes bump the collection's epoch,
+        # which is part of every key, so stale entries can never hit.
+        self._query_cache: OrderedDict = OrderedDict()
+        self._query_cache_max = 1024
+        self._collection_epochs: Dict[str, int] = {}
+
+    def _query_cache_key(
+        self,
+        collection_name: str,
+        query_vector: List[float],
+        limit: int,
+        score_threshold: float,
+        filter_conditions: Dict,
+        ef: int,
+        payload_fields: List[str],
+        with_vectors: bool
+    ) -> tuple:
+        digest = hashlib.blake2b(
+            array("f", query_vector).tobytes(), digest_size=16
+        ).digest()
+        filter_key = (
+            repr(sorted(filter_conditions.items())) if filter_conditions else None
+        )
+        return (
+            collection_name,
+            self._collection_epochs.get(collection_name, 0),
+            digest,
+            limit,
+            score_threshold,
+            filter_key,
+            ef,
+            tuple(payload_fields) if payload_fields else None,
+            with_vectors
+        )
+
+    def _invalidate_query_cache(self, collection_name: str) -> None:
+        """Bump the collection epoch; cached entries for older epochs can
+        no longer match and fall out of the LRU naturally."""
+        self._collection_epochs[collection_name] = (
+            self._collection_epochs.get(collection_name, 0) + 1
+        )
+
+    async def _collection_known(self, collection_name: str) -> bool:
+        """Cached existence check; hits the network only on a cache miss."""
+        if collection_name in self._known_collections:
+            return True
+        listing = await self.client.get_collections()
+        self._known_collections |= {col.name for col in listing.collections}
+        return collection_name in self._known_collections
+
+    async def create_collections(self) -> bool:
+        """Create all required Qdrant collections.
+
+        One listing replaces the per-collection existence checks, and the
+        creations are independent REST calls, so they run concurrently;
+        setup costs one round trip plus the slowest single create.
+        """
         try:
-            for collection_name, config in self.collections.items():
-                if not self.client.collection_exists(collection_name):
-                    logger.info(f"Creating collection: {collection_name}")
-                    self.client.create_collection(
+            listing = await self.client.get_collections()
+            existing = {col.name for col in listing.collections}
+
+            async def _create(collection_name: str, config: Dict[str, Any]):
+                logger.info(f"Creating collection: {collection_name}")
+                await self.client.create_collection(
                         collection_name=collection_name,
                         vectors_config=VectorParams(
                             size=config["vector_size"],
-                            distance=config["distance"]
+                            distance=config["distance"],
+                            # Raw fp32 vectors live on disk; searches run on
+                            # the int8 copy below and only touch disk when
+                            # rescoring
+                            on_disk=True
+                        ),
+                        # int8 scalar quantization: 4x less vector RAM and
+                        # SIMD int8 distance kernels. always_ram keeps the
+                        # quantized vectors resident.
+                        quantization_config=models.ScalarQuantization(
+                            scalar=models.ScalarQuantizationConfig(
+                                type=models.ScalarType.INT8,
+                                always_ram=True
+                            )
+                        ),
+                        # One segment per core so a single search fans out
+                        # across all cores
+                        optimizers_config=models.OptimizersConfigDiff(
+                            default_segment_number=os.cpu_count()
+                        ),
+                        hnsw_config=models.HnswConfigDiff(
+                            m=16,
+                            ef_construct=128,
+                            on_disk=False
                         )
-                    )
-                    logger.info(f"Collection {collection_name} created successfully")
-                else:
-                    logger.info(f"Collection {collection_name} already exists")
+                )
+                logger.info(f"Collection {collection_name} created successfully")
+
+            await asyncio.gather(*(
+                _create(collection_name, config)
+                for collection_name, config in self.collections.items()
+                if collection_name not in existing
+            ))
+            for collection_name in self.collections.keys() & existing:
+                logger.info(f"Collection {collection_name} already exists")
+            self._known_collections.update(self.collections.keys())
             
             return True
         except Exception as e:
             logger.error(f"Error creating collections: {str(e)}")
             return False
     
-    def delete_collections(self) -> bool:
+    async def delete_collections(self) -> bool:
         """Delete all collections (for testing/reset)"""
         try:
-            for collection_name in self.collections.keys():
-                if self.client.collection_exists(collection_name):
-                    self.client.delete_collection(collection_name)
-                    logger.info(f"Collection {collection_name} deleted")
+            listing = await self.client.get_collections()
+            existing = {col.name for col in listing.collections}
+
+            async def _delete(collection_name: str):
+                await self.client.delete_collection(collection_name)
+                logger.info(f"Collection {collection_name} deleted")
+
+            await asyncio.gather(*(
+                _delete(collection_name)
+                for collection_name in self.collections.keys() & existing
+            ))
+            self._known_collections -= self.collections.keys()
             return True
         except Exception as e:
             logger.error(f"Error deleting collections: {str(e)}")
             return False
     
-    def get_collection_info(self) -> Dict[str, Any]:
-        """Get information about all collections"""
+    async def get_collection_info(self) -> Dict[str, Any]:
+        """Get information about all collections.
+
+        One listing call establishes what exists, then the per-collection
+        detail requests go out concurrently instead of exists+get pairs
+        in sequence.
+        """
         info = {}
         try:
+            listing = await self.client.get_collections()
+            existing = {col.name for col in listing.collections}
+            self._known_collections |= existing
+
+            present = [
+                name for name in self.collections.keys() if name in existing
+            ]
+            details = await asyncio.gather(
+                *(self.client.get_collection(name) for name in present)
+            )
+            for collection_name, collection_info in zip(present, details):
+                info[collection_name] = {
+                    "status": collection_info.status,
+                    "points_count": collection_info.points_count,
+                    "vectors_count": collection_info.vectors_count,
+                    "config": collection_info.config.dict()
+                }
             for collection_name in self.collections.keys():
-                if self.client.collection_exists(collection_name):
-                    collection_info = self.client.get_collection(collection_name)
-                    info[collection_name] = {
-                        "status": collection_info.status,
-                        "points_count": collection_info.points_count,
-                        "vectors_count": collection_info.vectors_count,
-                        "config": collection_info.config.dict()
-                    }
-                else:
+                if collection_name not in existing:
                     info[collection_name] = {"status": "not_found"}
         except Exception as e:
             logger.error(f"Error getting collection info: {str(e)}")
             info["error"] = str(e)
-        
+
         return info
     
-    def upsert_points(self, collection_name: str, points: List[PointStruct]) -> bool:
-        """Upsert points to a collection"""
+    async def upsert_points(
+        self,
+        collection_name: str,
+        points: List[PointStruct],
+        batch_size: int = 512,
+        wait: bool = False,
+        parallel: int = 8
+    ) -> bool:
+        """Upsert points to a collection in parallel sub-batches.
+
+        wait=False returns once Qdrant acknowledges each batch instead of
+        blocking until HNSW insertion finishes; parallel bounds the number
+        of batches in flight.
+        """
         try:
-            if not self.client.collection_exists(collection_name):
+            if not await self._collection_known(collection_name):
                 logger.error(f"Collection {collection_name} does not exist")
                 return False
-            
-            operation_info = self.client.upsert(
-                collection_name=collection_name,
-                points=points
+
+            # Collections use DOT distance, which only equals cosine
+            # similarity for unit vectors; normalize here so no caller can
+            # skew rankings by upserting raw embeddings
+            for point in points:
+                if isinstance(point.vector, list):
+                    point.vector = l2_normalize(point.vector)
+
+            semaphore = asyncio.Semaphore(parallel)
+
+            async def _upsert_batch(batch: List[PointStruct]):
+                async with semaphore:
+                    await self.client.upsert(
+                        collection_name=collection_name,
+                        points=batch,
+                        wait=wait
+                    )
+
+            batches = [
+                points[i:i + batch_size]
+                for i in range(0, len(points), batch_size)
+            ]
+            await asyncio.gather(*(_upsert_batch(batch) for batch in batches))
+
+            self._invalidate_query_cache(collection_name)
+            logger.info(
+                f"Upserted {len(points)} points to {collection_name} "
+                f"in {len(batches)} batches"
             )
-            logger.info(f"Upserted {len(points)} points to {collection_name}")
             return True
         except Exception as e:
             logger.error(f"Error upserting points to {collection_name}: {str(e)}")
             return False
+
+    @asynccontextmanager
+    async def bulk_mode(self, collection_name: str):
+        """Disable HNSW build and indexing for the duration of a bulk load.
+
+        On exit the defaults are restored and Qdrant (re)indexes the newly
+        written segments in the background.
+        """
+        await self.client.update_collection(
+            collection_name=collection_name,
+            hnsw_config=models.HnswConfigDiff(m=0),
+            optimizer_config=models.OptimizersConfigDiff(indexing_threshold=0)
+        )
+        try:
+            yield self
+        finally:
+            await self.client.update_collection(
+                collection_name=collection_name,
+                hnsw_config=models.HnswConfigDiff(m=16),
+                optimizer_config=models.OptimizersConfigDiff(indexing_threshold=20000)
+            )
     
-    def search_similar(
+    async def search_similar(
         self, 
         collection_name: str, 
         query_vector: List[float], 
         limit: int = 10,
         score_threshold: float = 0.7,
-        filter_conditions: Dict = None
-    ) -> List[Dict]:
-        """Search for similar vectors in a collection"""
+        filter_conditions: Dict = None,
+        ef: int = 64,
+        payload_fields: List[str] = None,
+        with_vectors: bool = False
+    ) -> List[Hit]:
+        """Search for similar vectors in a collection.
+
+        ef bounds the HNSW beam width per query: lower it for cheap
+        best-effort lookups, raise it when recall matters more than
+        latency. payload_fields restricts the returned payload to the
+        listed keys (UI lists usually only need task_id and title);
+        vectors are omitted unless with_vectors is set.
+        """
         try:
-            if not self.client.collection_exists(collection_name):
+            if not await self._collection_known(collection_name):
                 logger.error(f"Collection {collection_name} does not exist")
                 return []
-            
-            search_result = self.client.search(
+
+            query_vector = l2_normalize(query_vector)
+            cache_key = self._query_cache_key(
+                collection_name, query_vector, limit,
+                score_threshold, filter_conditions, ef,
+                payload_fields, with_vectors
+            )
+            cached = self._query_cache.get(cache_key)
+            if cached is not None:
+                self._query_cache.move_to_end(cache_key)
+                return list(cached)
+
+            search_result = await self.client.search(
                 collection_name=collection_name,
                 query_vector=query_vector,
                 limit=limit,
                 score_threshold=score_threshold,
-                query_filter=models.Filter(**filter_conditions) if filter_conditions else None
+                query_filter=models.Filter(**filter_conditions) if filter_conditions else None,
+                # Only ship the payload keys the caller will actually read;
+                # full payloads dominate response parsing cost
+                with_payload=(
+                    models.PayloadSelectorInclude(include=payload_fields)
+                    if payload_fields else True
+                ),
+                with_vectors=with_vectors,
+                # Search the int8 vectors, then rescore the oversampled
+                # candidate set against the raw vectors for recall parity
+                search_params=models.SearchParams(
+                    hnsw_ef=ef,
+                    quantization=models.QuantizationSearchParams(
+                        rescore=True,
+                        oversampling=2.0
+                    )
+                )
             )
             
-            return [
-                {
-                    "id": hit.id,
-                    "score": hit.score,
-                    "payload": hit.payload
-                }
-                for hit in search_result
+            hits = [
+                Hit(hit.id, hit.score, hit.payload) for hit in search_result
             ]
+            self._query_cache[cache_key] = hits
+            if len(self._query_cache) > self._query_cache_max:
+                self._query_cache.popitem(last=False)
+            return list(hits)
         except Exception as e:
             logger.error(f"Error searching in {collection_name}: {str(e)}")
             return []
     
-    def delete_points(self, collection_name: str, point_ids: List[str]) -> bool:
+    async def search_batch(
+        self,
+        requests: List[tuple],
+        score_threshold: float = 0.7
+    ) -> List[List[Hit]]:
+        """Run several searches in as few round trips as possible.
+
+        requests is a list of (collection_name, query_vector, limit)
+        tuples. Queries are grouped per collection and each group goes to
+        Qdrant as one search_batch call, so a titles+content+context
+        lookup costs one RTT per collection instead of one per query.
+        Results come back in the same order as the input.
+        """
+        by_collection: Dict[str, List[int]] = {}
+        for i, (collection_name, _, _) in enumerate(requests):
+            by_collection.setdefault(collection_name, []).append(i)
+
+        results: List[List[Dict]] = [[] for _ in requests]
+
+        async def _run_group(collection_name: str, indices: List[int]):
+            try:
+                if not await self._collection_known(collection_name):
+                    logger.error(f"Collection {collection_name} does not exist")
+                    return
+                batch = await self.client.search_batch(
+                    collection_name=collection_name,
+                    requests=[
+                        models.SearchRequest(
+                            vector=l2_normalize(requests[i][1]),
+                            limit=requests[i][2],
+                            score_threshold=score_threshold,
+                            with_payload=True
+                        )
+                        for i in indices
+                    ]
+                )
+                for i, hits in zip(indices, batch):
+                    results[i] = [
+                        Hit(hit.id, hit.score, hit.payload) for hit in hits
+                    ]
+            except Exception as e:
+                logger.error(f"Error batch-searching {collection_name}: {str(e)}")
+
+        await asyncio.gather(*(
+            _run_group(name, indices)
+            for name, indices in by_collection.items()
+        ))
+        return results
+
+    async def delete_points(self, collection_name: str, point_ids: List[str]) -> bool:
         """Delete specific points from a collection"""
         try:
-            if not self.client.collection_exists(collection_name):
+            if not await self._collection_known(collection_name):
                 logger.error(f"Collection {collection_name} does not exist")
                 return False
             
-            self.client.delete(
+            await self.client.delete(
                 collection_name=collection_name,
                 points_selector=models.PointIdsList(points=point_ids)
             )
+            self._invalidate_query_cache(collection_name)
             logger.info(f"Deleted {len(point_ids)} points from {collection_name}")
             return True
         except Exception as e:
             logger.error(f"Error deleting points from {collection_name}: {str(e)}")
             return False
     
-    def health_check(self) -> Dict[str, Any]:
+    async def health_check(self) -> Dict[str, Any]:
         """Check the health of Qdrant connection"""
         try:
-            collections = self.client.get_collections()
+            collections = await self.client.get_collections()
+            # Refresh the existence cache while we have a fresh listing
+            self._known_collections = {col.name for col in collections.collections}
             return {
                 "status": "healthy",
                 "collections_count": len(collections.collections),
@@ -180,5 +474,11 @@ class VibeQdrantClient:
                 "error": str(e)
             }
 
-# Global instance
-qdrant_client = VibeQdrantClient()
\ No newline at end of file
+@functools.lru_cache(maxsize=1)
+def get_qdrant_client() -> VibeQdrantClient:
+    """Shared client, built on first use.
+
+    Instantiating at import time opened a gRPC connection for every
+    importer, even CLI paths that never talk to Qdrant.
+    """
+    return VibeQdrantClient()
\ No newline at end of file
@@ -1,12 +1,147 @@
+import asyncio
 import os
 import csv
 import io
+import re
+from concurrent.futures import ProcessPoolExecutor
 from typing import Optional
 from pathlib import Path
 import aiofiles
 from PyPDF2 import PdfReader
 from docx import Document
 
+try:
+    import pyarrow.csv as pa_csv
+except ImportError:  # pragma: no cover - optional fast path
+    pa_csv = None
+
+# Markdown cleanup patterns, compiled once at import instead of per call.
+# Only the ``` fence lines are stripped; the code between them is real
+# content and stays in the extracted text.
+_MD_CODEBLOCK = re.compile(r'(?m)^```[^\n]*\n?')
+_MD_LINK = re.compile(r'\[([^\]]+)\]\([^)]+\)')
+_MD_HEADER = re.compile(r'(?m)^#+\s*')
+_MD_INLINE = re.compile(r'[*`]')
+
+# CPU-bound document parsing runs here instead of on the event loop, so a
+# large PDF can't stall API traffic and ingest scales with core count.
+# Workers are only spawned on first use.
+_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+
+
+def _sync_extract_pdf(file_path: str, max_text_length: int) -> Optional[str]:
+    """Parse a PDF in a worker process; must stay module-level picklable."""
+    try:
+        reader = PdfReader(file_path)
+        text_parts = []
+        running_len = 0
+
+        for page in reader.pages:
+            text = page.extract_text()
+            if text:
+                text_parts.append(text)
+                # +1 for the newline the final join inserts
+                running_len += len(text) + 1
+                if running_len > max_text_length:
+                    break
+
+        return '\n'.join(text_parts)[:max_text_length]
+    except Exception as e:
+        print(f"Error extracting from PDF: {e}")
+        return None
+
+
+def _sync_extract_docx(file_path: str, max_text_length: int) -> Optional[str]:
+    """Parse a DOCX in a worker process; must stay module-level picklable."""
+    try:
+        doc = Document(file_path)
+        text_parts = []
+        running_len = 0
+
+        for paragraph in doc.paragraphs:
+            if paragraph.text.strip():
+                text_parts.append(paragraph.text)
+                running_len += len(paragraph.text) + 1
+                if running_len > max_text_length:
+                    break
+
+        return '\n'.join(text_parts)[:max_text_length]
+    except Exception as e:
+        print(f"Error extracting from DOCX: {e}")
+        return None
+
+
+def _arrow_extract_csv(file_path: str, max_text_length: int) -> Optional[str]:
+    """Parse a CSV with pyarrow's multithreaded C parser.
+
+    Releases the GIL while parsing, so this runs in a plain thread. Rows
+    beyond what max_text_length can possibly hold are sliced off before
+    any Python string formatting happens.
+    """
+    # Same delimiter detection as the stdlib fallback; pyarrow defaults
+    # to comma and would read a semicolon-separated file as one column
+    with open(file_path, 'r', encoding='utf-8') as csvfile:
+        sample = csvfile.read(1024)
+    try:
+        delimiter = csv.Sniffer().sniff(sample).delimiter
+    except csv.Error:
+        delimiter = ','
+
+    table = pa_csv.read_csv(
+        file_path,
+        read_options=pa_csv.ReadOptions(block_size=1 << 20),
+        parse_options=pa_csv.ParseOptions(delimiter=delimiter)
+    )
+    # Cheapest possible upper bound: even one-character cells need a
+    # separator, so max_text_length rows always suffice
+    table = table.slice(0, max_text_length)
+
+    text_parts = ["Headers: " + ", ".join(table.column_names)]
+    running_len = len(text_parts[0]) + 1
+    for row_num, row in enumerate(table.to_pylist(), start=1):
+        line = "Row {}: {}".format(
+            row_num, ", ".join("" if v is None else str(v) for v in row.values())
+        )
+        text_parts.append(line)
+        running_len += len(line) + 1
+        if running_len > max_text_length:
+            break
+
+    return '\n'.join(text_parts)[:max_text_length]
+
+
+def _sync_extract_csv(file_path: str, max_text_length: int) -> Optional[str]:
+    """Parse a CSV in a worker process; must stay module-level picklable."""
+    try:
+        text_parts = []
+
+        with open(file_path, 'r', encoding='utf-8', newline='') as csvfile:
+            # Try to detect delimiter
+            sample = csvfile.read(1024)
+            csvfile.seek(0)
+            sniffer = csv.Sniffer()
+            delimiter = sniffer.sniff(sample).delimiter
+
+            reader = csv.reader(csvfile, delimiter=delimiter)
+            running_len = 0
+
+            for row_num, row in enumerate(reader):
+                if row_num == 0:
+                    # Header row
+                    line = "Headers: " + ", ".join(row)
+                else:
+                    # Data rows
+                    line = "Row {}: {}".format(row_num, ", ".join(row))
+                text_parts.append(line)
+                running_len += len(line) + 1
+                if running_len > max_text_length:
+                    break
+
+        return '\n'.join(text_parts)[:max_text_length]
+    except Exception as e:
+        print(f"Error extracting from CSV: {e}")
+        return None
+
 
 class TextExtractor:
     """Handles text extraction from various document formats."""
@@ -35,45 +170,16 @@ class TextExtractor:
             return None
     
     async def _extract_from_pdf(self, file_path: str) -> Optional[str]:
-        """Extract text from PDF file."""
-        try:
-            reader = PdfReader(file_path)
-            text_parts = []
-            
-            for page in reader.pages:
-                text = page.extract_text()
-                if text:
-                    text_parts.append(text)
-                
-                # Check length limit
-                combined_text = '\n'.join(text_parts)
-                if len(combined_text) > self.max_text_length:
-                    return combined_text[:self.max_text_length]
-            
-            return '\n'.join(text_parts)
-        except Exception as e:
-            print(f"Error extracting from PDF: {e}")
-            return None
+        """Extract text from PDF file in a worker process."""
+        return await asyncio.get_running_loop().run_in_executor(
+            _pool, _sync_extract_pdf, file_path, self.max_text_length
+        )
     
     async def _extract_from_docx(self, file_path: str) -> Optional[str]:
-        """Extract text from DOCX file."""
-        try:
-            doc = Document(file_path)
-            text_parts = []
-            
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    text_parts.append(paragraph.text)
-                
-                # Check length limit
-                combined_text = '\n'.join(text_parts)
-                if len(combined_text) > self.max_text_length:
-                    return combined_text[:self.max_text_length]
-            
-            return '\n'.join(text_parts)
-        except Exception as e:
-            print(f"Error extracting from DOCX: {e}")
-            return None
+        """Extract text from DOCX file in a worker process."""
+        return await asyncio.get_running_loop().run_in_executor(
+            _pool, _sync_extract_docx, file_path, self.max_text_length
+        )
     
     async def _extract_from_txt(self, file_path: str) -> Optional[str]:
         """Extract text from plain text file."""
@@ -95,36 +201,17 @@ class TextExtractor:
             return None
     
     async def _extract_from_csv(self, file_path: str) -> Optional[str]:
-        """Extract text from CSV file."""
-        try:
-            text_parts = []
-            
-            with open(file_path, 'r', encoding='utf-8', newline='') as csvfile:
-                # Try to detect delimiter
-                sample = csvfile.read(1024)
-                csvfile.seek(0)
-                sniffer = csv.Sniffer()
-                delimiter = sniffer.sniff(sample).delimiter
-                
-                reader = csv.reader(csvfile, delimiter=delimiter)
-                
-                for row_num, row in enumerate(reader):
-                    if row_num == 0:
-                        # Header row
-                        text_parts.append("Headers: " + ", ".join(row))
-                    else:
-                        # Data rows
-                        text_parts.append("Row {}: {}".format(row_num, ", ".join(row)))
-                    
-                    # Check length limit
-                    combined_text = '\n'.join(text_parts)
-                    if len(combined_text) > self.max_text_length:
-                        return combined_text[:self.max_text_length]
-            
-            return '\n'.join(text_parts)
-        except Exception as e:
-            print(f"Error extracting from CSV: {e}")
-            return None
+        """Extract text from CSV file off the event loop."""
+        if pa_csv is not None:
+            try:
+                return await asyncio.to_thread(
+                    _arrow_extract_csv, file_path, self.max_text_length
+                )
+            except Exception as e:
+                print(f"pyarrow CSV parse failed, falling back to csv: {e}")
+        return await asyncio.get_running_loop().run_in_executor(
+            _pool, _sync_extract_csv, file_path, self.max_text_length
+        )
     
     async def _extract_from_markdown(self, file_path: str) -> Optional[str]:
         """Extract text from Markdown file."""
@@ -142,33 +229,10 @@ class TextExtractor:
     
     def _clean_markdown(self, content: str) -> str:
         """Basic markdown cleanup - remove formatting but keep structure."""
-        lines = content.split('\n')
-        cleaned_lines = []
-        
-        for line in lines:
-            # Remove markdown headers
-            if line.startswith('#'):
-                cleaned_lines.append(line.lstrip('#').strip())
-            # Remove code blocks
-            elif line.startswith('```'):
-                continue
-            # Remove inline code formatting
-            elif '`' in line:
-                cleaned_lines.append(line.replace('`', ''))
-            # Remove bold/italic formatting
-            elif '**' in line or '*' in line:
-                cleaned_line = line.replace('**', '').replace('*', '')
-                cleaned_lines.append(cleaned_line)
-            # Remove links but keep text
-            elif '[' in line and ']' in line:
-                import re
-                # Simple regex to extract link text
-                cleaned_line = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', line)
-                cleaned_lines.append(cleaned_line)
-            else:
-                cleaned_lines.append(line)
-        
-        return '\n'.join(cleaned_lines)
+        cleaned = _MD_CODEBLOCK.sub('', content)
+        cleaned = _MD_LINK.sub(r'\1', cleaned)
+        cleaned = _MD_HEADER.sub('', cleaned)
+        return _MD_INLINE.sub('', cleaned)
     
     def get_text_summary(self, text: str, max_length: int = 500) -> str:
         """Get a summary of extracted text."""
@@ -6,62 +6,233 @@ Creates test data for development and testing
 
 import sys
 import os
+import csv
+import io
+import itertools
+import json
 import logging
+import random
+import time
 from pathlib import Path
 from datetime import datetime, timedelta
 import uuid
-from faker import Faker
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 
 # Add the app directory to Python path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from sqlalchemy.orm import Session
 from app.database import SessionLocal, engine
-from app.models import User, Project, ProjectMember, Task, Comment, Base
+from app.models import (
+    User, Project, ProjectMember, Task, Comment, Base,
+    TaskStatus, TaskPriority, MemberRole, EmbeddingType, FileType
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
-fake = Faker()
-
-def create_test_users(db: Session, count: int = 10) -> list[User]:
-    """Create test users"""
-    users = []
-    
-    # Create admin user
-    admin_user = User(
-        id=uuid.uuid4(),
-        email="admin@vibekanban.com",
-        username="admin",
-        full_name="Admin User",
-        hashed_password="$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LwkF8m.QYhKQTjpzm",  # password: admin123
-        is_active=True,
-        is_superuser=True
-    )
-    db.add(admin_user)
-    users.append(admin_user)
-    
-    # Create regular test users
-    for i in range(count - 1):
-        user = User(
-            id=uuid.uuid4(),
-            email=fake.email(),
-            username=f"user_{i+1}",
-            full_name=fake.name(),
-            hashed_password="$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LwkF8m.QYhKQTjpzm",  # password: password123
-            is_active=True,
-            is_superuser=False
+
+
+def _fast_random_element(self, elements=('a', 'b', 'c')):
+    """Drop-in for BaseProvider.random_element without the per-call tuple
+    rebuild.
+
+    Faker turns its OrderedDict of choices back into a tuple on every
+    call, which dominates seeding time once the helpers run tens of
+    thousands of draws. Cache the key tuple on the container the first
+    time and pick with random.choice after that. Seed data doesn't need
+    the weighted-draw semantics, so weights are ignored.
+    """
+    if isinstance(elements, OrderedDict):
+        cached = getattr(elements, '_cached_choice_list', None)
+        if cached is None:
+            cached = tuple(elements.keys())
+            elements._cached_choice_list = cached
+        return random.choice(cached)
+    return random.choice(tuple(elements) if not isinstance(elements, (list, tuple)) else elements)
+
+
+# Faker loads locale data worth seconds of import time; it is pulled in
+# lazily by _init_faker() so reset-only and --help runs never pay for it
+fake = None
+
+
+def _init_faker():
+    """Import Faker, apply the random_element patch, and build the shared
+    instance on first use."""
+    global fake
+    if fake is not None:
+        return
+    import faker.providers
+    from faker import Faker
+    faker.providers.BaseProvider.random_element = _fast_random_element
+    fake = Faker()
+    # Fixed seeds: re-runs generate identical data, which keeps CI stable
+    # and lets warmed caches (like the random_element tuple cache) pay off
+    # across identical passes
+    Faker.seed(42)
+    random.seed(42)
+
+TASK_LABELS = ("frontend", "backend", "bug", "feature", "urgent", "api")
+
+# bcrypt of the shared dev password; one interned string referenced by
+# every seeded user row instead of a literal re-parsed per iteration
+HASHED_PW = "$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LwkF8m.QYhKQTjpzm"
+
+
+# Set by --copy: stream rows through COPY FROM STDIN instead of INSERTs
+USE_COPY = False
+
+
+def _copy_rows(db: Session, model, rows: list[dict]):
+    """Load rows with COPY, the fastest bulk path Postgres has.
+
+    COPY bypasses per-statement parse/plan entirely; one network write
+    per table replaces even the multi-VALUES INSERT batches. Runs on the
+    session's own connection so it stays inside the seed transaction.
+    """
+    columns = list(rows[0].keys())
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for row in rows:
+        writer.writerow([
+            json.dumps(value) if isinstance(value, (dict, list)) else value
+            for value in (row[col] for col in columns)
+        ])
+    buf.seek(0)
+    
+    raw_conn = db.connection().connection
+    with raw_conn.cursor() as cur:
+        cur.copy_expert(
+            f"COPY {model.__table__.name} ({', '.join(columns)}) "
+            "FROM STDIN WITH (FORMAT csv)",
+            buf
         )
-        db.add(user)
-        users.append(user)
+
+
+def _bulk_insert(db: Session, model, rows: list[dict]):
+    """Route a batch of dict rows to COPY or bulk_insert_mappings.
+
+    bulk_insert_mappings already skips the unit-of-work machinery that
+    bulk_save_objects(return_defaults=False) would only partially avoid,
+    and ids are assigned client-side so nothing needs RETURNING.
+    render_nulls keeps every row in one statement shape even when
+    optional keys are missing, so batches never split by key set.
+    """
+    if not rows:
+        return
+    if USE_COPY:
+        _copy_rows(db, model, rows)
+    else:
+        db.bulk_insert_mappings(model, rows, render_nulls=True)
+
+
+def _create_enum_types():
+    """Create the native enum types before create_all.
+
+    The ENUM columns are declared with create_type=False because the
+    migrations own the types, but on a fresh database seeded without
+    alembic they don't exist yet and CREATE TABLE would fail.
+    checkfirst makes this a no-op on migrated databases.
+    """
+    for enum_type in (TaskStatus, TaskPriority, MemberRole, EmbeddingType, FileType):
+        enum_type.create(bind=engine, checkfirst=True)
+
+
+def _detach_indexes() -> list:
+    """Strip Index objects off the metadata so create_all builds bare
+    tables; returns the stash for later recreation."""
+    stashed = []
+    for table in Base.metadata.tables.values():
+        stashed.extend(table.indexes)
+        table.indexes.clear()
+    return stashed
+
+
+def _reattach_indexes(stashed: list, build: bool = True):
+    """Put stashed Index objects back on their tables and, unless build
+    is False, create any that are missing in the database."""
+    for index in stashed:
+        index.table.indexes.add(index)
+        if build:
+            index.create(bind=engine, checkfirst=True)
+
+
+def _worker_rngs(n: int) -> list[tuple[np.random.Generator, random.Random]]:
+    """Build n independent (numpy, stdlib) generator pairs.
+
+    np.random.Generator is not thread-safe, and neither is the module
+    random state, so each seeding worker gets its own pair spawned from
+    one fixed SeedSequence. Worker assignment is deterministic, which
+    keeps re-runs producing identical data.
+    """
+    return [
+        (np.random.default_rng(seq), random.Random(int(seq.generate_state(1)[0])))
+        for seq in np.random.SeedSequence(42).spawn(n)
+    ]
+
+
+def rand_datetimes(rng: np.random.Generator, start_offset_days: int,
+                   end_offset_days: int, n: int) -> list[datetime]:
+    """Draw n uniform datetimes inside a day-offset window.
+
+    One vectorized integer draw replaces n Faker date_time_between
+    calls, each of which parses its offset strings through dateutil.
+    """
+    now = int(time.time())
+    lo = now + start_offset_days * 86400
+    hi = now + end_offset_days * 86400
+    return rng.integers(lo, hi, size=n).astype('datetime64[s]').tolist()
+
+
+def batch_uuids(n: int) -> list[uuid.UUID]:
+    """Generate n random UUIDs from a single urandom read.
+
+    uuid.uuid4() performs one os.urandom syscall per id; slicing one
+    buffer amortizes that to a single call per entity batch.
+    """
+    buf = os.urandom(n * 16)
+    return [uuid.UUID(bytes=buf[i * 16:(i + 1) * 16], version=4) for i in range(n)]
+
+def create_test_users(db: Session, count: int = 10) -> list[dict]:
+    """Create test users.
+
+    All seeders build plain dict rows and load them with
+    bulk_insert_mappings: a handful of multi-row INSERTs instead of one
+    ORM flush per row. Downstream helpers only need ids, so the row
+    dicts double as the return value.
+    """
+    ids = iter(batch_uuids(count))
+    
+    # Admin user first; password: admin123 (password123 for the rest)
+    users = [{
+        "id": next(ids),
+        "email": "admin@vibekanban.com",
+        "username": "admin",
+        "full_name": "Admin User",
+        "hashed_password": HASHED_PW,
+        "is_active": True,
+        "is_superuser": True
+    }]
+    
+    users.extend({
+        "id": next(ids),
+        "email": fake.email(),
+        "username": f"user_{i+1}",
+        "full_name": fake.name(),
+        "hashed_password": HASHED_PW,
+        "is_active": True,
+        "is_superuser": False
+    } for i in range(count - 1))
     
-    db.commit()
+    _bulk_insert(db, User, users)
     logger.info(f"Created {len(users)} test users")
     return users
 
-def create_test_projects(db: Session, users: list[User], count: int = 5) -> list[Project]:
+def create_test_projects(db: Session, users: list[dict], count: int = 5) -> list[dict]:
     """Create test projects"""
-    projects = []
-    
     project_names = [
         "Website Redesign",
         "Mobile App Development",
@@ -70,59 +241,74 @@ def create_test_projects(db: Session, users: list[User], count: int = 5) -> list
         "User Authentication System"
     ]
     
-    for i in range(min(count, len(project_names))):
-        project = Project(
-            id=uuid.uuid4(),
-            name=project_names[i],
-            description=fake.text(max_nb_chars=200),
-            owner_id=users[i % len(users)].id,
-            is_active=True,
-            settings={
-                "task_statuses": ["todo", "in_progress", "in_review", "done"],
-                "priority_levels": ["low", "medium", "high", "urgent"],
-                "auto_assign": False
-            }
-        )
-        db.add(project)
-        projects.append(project)
+    ids = iter(batch_uuids(min(count, len(project_names))))
     
-    db.commit()
+    projects = [{
+        "id": next(ids),
+        "name": project_names[i],
+        "description": fake.text(max_nb_chars=200),
+        "owner_id": users[i % len(users)]["id"],
+        "is_active": True,
+        "settings": {
+            "task_statuses": ["todo", "in_progress", "in_review", "done"],
+            "priority_levels": ["low", "medium", "high", "urgent"],
+            "auto_assign": False
+        }
+    } for i in range(min(count, len(project_names)))]
+    
+    _bulk_insert(db, Project, projects)
     logger.info(f"Created {len(projects)} test projects")
     return projects
 
-def create_project_members(db: Session, projects: list[Project], users: list[User]):
-    """Add users as members to projects"""
-    members_count = 0
-    
-    for project in projects:
-        # Add 3-5 random users to each project
-        project_users = fake.random_elements(elements=users, length=fake.random_int(min=3, max=5), unique=True)
-        
-        for user in project_users:
-            # Skip if user is already the owner
-            if user.id == project.owner_id:
+def create_project_members(db: Session, projects: list[dict], users: list[dict],
+                           rng: np.random.Generator, rnd: random.Random):
+    """Add users as members to projects.
+
+    Candidate selection is vectorized: one rng.integers call draws the
+    user-index matrix for every project, so the Python loop only
+    assembles row dicts. Duplicate draws and the owner are dropped per
+    project, which lands membership in the same 3-5 range as before.
+    """
+    members = []
+
+    candidate_idx = rng.integers(0, len(users), size=(len(projects), 5))
+
+    for project, indices in zip(projects, candidate_idx):
+        seen = set()
+        for idx in indices:
+            user = users[idx]
+            # Skip duplicates and the owner
+            if idx in seen or user["id"] == project["owner_id"]:
                 continue
-                
-            member = ProjectMember(
-                id=uuid.uuid4(),
-                project_id=project.id,
-                user_id=user.id,
-                role=fake.random_element(elements=["admin", "member", "viewer"]),
-                joined_at=fake.date_time_between(start_date='-30d', end_date='now')
-            )
-            db.add(member)
-            members_count += 1
-    
-    db.commit()
-    logger.info(f"Created {members_count} project members")
-
-def create_test_tasks(db: Session, projects: list[Project], users: list[User], tasks_per_project: int = 15) -> list[Task]:
-    """Create test tasks"""
+            seen.add(idx)
+
+            members.append({
+                "project_id": project["id"],
+                "user_id": user["id"],
+                "role": rnd.choice(("admin", "member", "viewer"))
+            })
+
+    for member, member_id, joined_at in zip(
+        members, batch_uuids(len(members)), rand_datetimes(rng, -30, 0, len(members))
+    ):
+        member["id"] = member_id
+        member["joined_at"] = joined_at
+    _bulk_insert(db, ProjectMember, members)
+    logger.info(f"Created {len(members)} project members")
+
+def create_test_tasks(db: Session, projects: list[dict], users: list[dict],
+                      rng: np.random.Generator, rnd: random.Random,
+                      desc_pool: list[str], tasks_per_project: int = 15) -> list[dict]:
+    """Create test tasks.
+
+    desc_pool is built by the caller (Faker is not thread-safe) and
+    indexed into per row instead of paying Faker's provider dispatch.
+    """
     tasks = []
-    statuses = ["todo", "in_progress", "in_review", "done", "cancelled"]
-    priorities = ["low", "medium", "high", "urgent"]
-    
-    task_titles = [
+    statuses = ("todo", "in_progress", "in_review", "done", "cancelled")
+    priorities = ("low", "medium", "high", "urgent")
+
+    task_titles = (
         "Design landing page",
         "Implement user authentication",
         "Create database schema",
@@ -138,75 +324,163 @@ def create_test_tasks(db: Session, projects: list[Project], users: list[User], t
         "Update dependencies",
         "Refactor code structure",
         "Add logging system"
-    ]
+    )
     
+    total = len(projects) * tasks_per_project
+    ids = iter(batch_uuids(total))
+    due_dates = iter(rand_datetimes(rng, 1, 30, total))
+
+    # Suffix strings are the same for every project; format them once
+    # instead of running the f-string machinery per row
+    suffixes = [f" #{i+1}" for i in range(tasks_per_project)]
+
+    # Structure-of-arrays: every random per-row field is drawn in one
+    # vectorized pass, so the loop below only assembles dicts by index
+    status_idx = rng.integers(0, len(statuses), size=total)
+    priority_idx = rng.integers(0, len(priorities), size=total)
+    assignee_idx = rng.integers(0, len(users), size=total)
+    has_assignee = rng.random(total) < 0.70
+    has_due = rng.random(total) < 0.60
+    estimated = rng.integers(1, 41, size=total)
+    has_estimated = rng.random(total) < 0.50
+    actual = rng.integers(1, 51, size=total)
+    has_actual = rng.random(total) < 0.30
+
+    k = 0
     for project in projects:
         for i in range(tasks_per_project):
-            task = Task(
-                id=uuid.uuid4(),
-                title=fake.random_element(elements=task_titles) + f" #{i+1}",
-                description=fake.text(max_nb_chars=500),
-                project_id=project.id,
-                assignee_id=fake.random_element(elements=users).id if fake.boolean(chance_of_getting_true=70) else None,
-                status=fake.random_element(elements=statuses),
-                priority=fake.random_element(elements=priorities),
-                labels=fake.random_elements(elements=["frontend", "backend", "bug", "feature", "urgent", "api"], length=fake.random_int(min=0, max=3), unique=True),
-                due_date=fake.date_time_between(start_date='+1d', end_date='+30d') if fake.boolean(chance_of_getting_true=60) else None,
-                estimated_hours=fake.random_int(min=1, max=40) if fake.boolean(chance_of_getting_true=50) else None,
-                actual_hours=fake.random_int(min=1, max=50) if fake.boolean(chance_of_getting_true=30) else None,
-                order_index=i
-            )
-            db.add(task)
-            tasks.append(task)
-    
-    db.commit()
+            tasks.append({
+                "id": next(ids),
+                "title": rnd.choice(task_titles) + suffixes[i],
+                "description": rnd.choice(desc_pool),
+                "project_id": project["id"],
+                "assignee_id": users[assignee_idx[k]]["id"] if has_assignee[k] else None,
+                "status": statuses[status_idx[k]],
+                "priority": priorities[priority_idx[k]],
+                "labels": rnd.sample(TASK_LABELS, rnd.randint(0, 3)),
+                "due_date": next(due_dates) if has_due[k] else None,
+                "estimated_hours": int(estimated[k]) if has_estimated[k] else None,
+                "actual_hours": int(actual[k]) if has_actual[k] else None,
+                "order_index": i
+            })
+            k += 1
+    
+    _bulk_insert(db, Task, tasks)
     logger.info(f"Created {len(tasks)} test tasks")
     return tasks
 
-def create_test_comments(db: Session, tasks: list[Task], users: list[User], comments_per_task: int = 3):
-    """Create test comments"""
+def create_test_comments(db: Session, tasks: list[dict], users: list[dict],
+                         rng: np.random.Generator, rnd: random.Random,
+                         content_pool: list[str],
+                         comments_per_task: int = 3, chunk_size: int = 10000):
+    """Create test comments.
+
+    Rows stream out of a generator and load in fixed-size chunks, so
+    peak memory stays flat however far the seed volumes are scaled up;
+    ids and timestamps are batch-assigned per chunk. content_pool is
+    built by the caller (Faker is not thread-safe).
+    """
+    def gen_comments():
+        for task in tasks:
+            # Not all tasks have comments
+            if rnd.random() < 0.60:
+                for _ in range(rnd.randint(1, comments_per_task)):
+                    yield {
+                        "task_id": task["id"],
+                        "author_id": rnd.choice(users)["id"],
+                        "content": rnd.choice(content_pool)
+                    }
+
     comments_count = 0
+    rows = gen_comments()
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            break
+        for comment, comment_id, created_at in zip(
+            chunk, batch_uuids(len(chunk)), rand_datetimes(rng, -7, 0, len(chunk))
+        ):
+            comment["id"] = comment_id
+            comment["created_at"] = created_at
+        _bulk_insert(db, Comment, chunk)
+        comments_count += len(chunk)
     
-    for task in tasks:
-        # Not all tasks have comments
-        if fake.boolean(chance_of_getting_true=60):
-            num_comments = fake.random_int(min=1, max=comments_per_task)
-            
-            for i in range(num_comments):
-                comment = Comment(
-                    id=uuid.uuid4(),
-                    task_id=task.id,
-                    author_id=fake.random_element(elements=users).id,
-                    content=fake.text(max_nb_chars=300),
-                    created_at=fake.date_time_between(start_date='-7d', end_date='now')
-                )
-                db.add(comment)
-                comments_count += 1
-    
-    db.commit()
     logger.info(f"Created {comments_count} test comments")
 
 def seed_database():
     """Main seeding function"""
     print("🌱 Seeding database with test data...")
     
-    # Create database tables
+    _init_faker()
+    
+    # Create database tables without secondary indexes: loading into
+    # indexed tables pays maintenance per row, while building each index
+    # once over the final data is a single sort. They are recreated in
+    # the finally block whether or not seeding ran.
+    _create_enum_types()
+    stashed_indexes = _detach_indexes()
     Base.metadata.create_all(bind=engine)
     
-    db = SessionLocal()
     try:
-        # Check if data already exists
-        existing_users = db.query(User).count()
-        if existing_users > 0:
-            print(f"⚠️  Database already contains {existing_users} users. Use --reset to clear existing data.")
-            return False
-        
-        # Create test data
-        users = create_test_users(db, count=10)
-        projects = create_test_projects(db, users, count=5)
-        create_project_members(db, projects, users)
-        tasks = create_test_tasks(db, projects, users, tasks_per_project=15)
-        create_test_comments(db, tasks, users, comments_per_task=3)
+        # Users and projects are the prerequisites for everything else;
+        # they commit first in one transaction so the worker sessions
+        # below can see them
+        with SessionLocal() as db, db.begin():
+            # Check if data already exists; a LIMIT 1 probe instead of
+            # count(), which aggregates the whole table just to test
+            # emptiness. The count is only computed for the warning.
+            if db.query(User.id).first() is not None:
+                existing_users = db.query(User).count()
+                print(f"⚠️  Database already contains {existing_users} users. Use --reset to clear existing data.")
+                return False
+            
+            users = create_test_users(db, count=10)
+            projects = create_test_projects(db, users, count=5)
+
+        # Text pools come from the single shared Faker instance, so they
+        # are built serially here before any worker starts
+        desc_pool = [fake.text(max_nb_chars=500) for _ in range(256)]
+        content_pool = [fake.text(max_nb_chars=300) for _ in range(256)]
+
+        # Members, tasks and comments only depend on the rows above, so
+        # they load concurrently, each worker with its own session and
+        # transaction. The driver releases the GIL during DB round trips,
+        # so a thread pool overlaps them fully. Each worker slot draws
+        # from its own spawned generator pair; sharing _np_rng or the
+        # module random state across threads corrupts the streams.
+        n_workers = 4
+        rngs = _worker_rngs(2 * n_workers + 1)
+
+        def seed_members(rng, rnd):
+            with SessionLocal() as worker_db, worker_db.begin():
+                create_project_members(worker_db, projects, users, rng, rnd)
+
+        def seed_tasks(project_chunk, rng, rnd):
+            with SessionLocal() as worker_db, worker_db.begin():
+                return create_test_tasks(worker_db, project_chunk, users,
+                                         rng, rnd, desc_pool, tasks_per_project=15)
+
+        def seed_comments(task_chunk, rng, rnd):
+            with SessionLocal() as worker_db, worker_db.begin():
+                create_test_comments(worker_db, task_chunk, users,
+                                     rng, rnd, content_pool, comments_per_task=3)
+
+        with ThreadPoolExecutor(max_workers=n_workers) as pool:
+            members_future = pool.submit(seed_members, *rngs[0])
+            task_futures = [
+                pool.submit(seed_tasks, projects[i::n_workers], *rngs[1 + i])
+                for i in range(n_workers)
+            ]
+            tasks = [task for future in task_futures for task in future.result()]
+            members_future.result()
+
+            comment_futures = [
+                pool.submit(seed_comments, tasks[i::n_workers],
+                            *rngs[1 + n_workers + i])
+                for i in range(n_workers)
+            ]
+            for future in comment_futures:
+                future.result()
         
         print("✅ Database seeded successfully!")
         print(f"📊 Created: {len(users)} users, {len(projects)} projects, {len(tasks)} tasks")
@@ -214,10 +488,9 @@ def seed_database():
         
     except Exception as e:
         logger.error(f"Error seeding database: {str(e)}")
-        db.rollback()
         return False
     finally:
-        db.close()
+        _reattach_indexes(stashed_indexes)
 
 def reset_database():
     """Reset database by dropping and recreating all tables"""
@@ -225,7 +498,17 @@ def reset_database():
     
     try:
         Base.metadata.drop_all(bind=engine)
-        Base.metadata.create_all(bind=engine)
+        _create_enum_types()
+        # Recreate bare tables only: building the secondary indexes here
+        # would mean the seed load that always follows in the --reset
+        # flow pays index maintenance per row. The indexes go back on the
+        # metadata (without touching the database) so seed_database()'s
+        # detach/reattach cycle stashes and builds them after the load.
+        stashed_indexes = _detach_indexes()
+        try:
+            Base.metadata.create_all(bind=engine)
+        finally:
+            _reattach_indexes(stashed_indexes, build=False)
         print("✅ Database reset completed")
         return True
     except Exception as e:
@@ -234,6 +517,10 @@ def reset_database():
 
 def main():
     """Main function"""
+    global USE_COPY
+    if "--copy" in sys.argv:
+        USE_COPY = True
+    
     if len(sys.argv) > 1 and sys.argv[1] == "--reset":
         if reset_database():
             success = seed_database()
@@ -6,23 +6,26 @@ Creates and configures all required Qdrant collections
 
 import sys
 import os
+import asyncio
 import logging
 from pathlib import Path
 
 # Add the app directory to Python path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.qdrant_client import qdrant_client
+from app.qdrant_client import get_qdrant_client
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def setup_qdrant():
+async def setup_qdrant():
     """Set up all Qdrant collections"""
     print("🚀 Setting up Qdrant collections for Vibe Kanban...")
     
+    qdrant_client = get_qdrant_client()
+    
     # Health check first
-    health = qdrant_client.health_check()
+    health = await qdrant_client.health_check()
     if health["status"] != "healthy":
         print(f"❌ Qdrant health check failed: {health.get('error', 'Unknown error')}")
         return False
@@ -30,7 +33,7 @@ def setup_qdrant():
     print(f"✅ Qdrant is healthy. Found {health['collections_count']} existing collections.")
     
     # Create collections
-    success = qdrant_client.create_collections()
+    success = await qdrant_client.create_collections()
     if not success:
         print("❌ Failed to create collections")
         return False
@@ -38,7 +41,7 @@ def setup_qdrant():
     print("✅ All collections created successfully!")
     
     # Get collection info
-    info = qdrant_client.get_collection_info()
+    info = await qdrant_client.get_collection_info()
     print("\n📊 Collection Status:")
     for collection_name, collection_info in info.items():
         if "error" in collection_info:
@@ -52,12 +55,14 @@ def setup_qdrant():
     
     return True
 
-def reset_qdrant():
+async def reset_qdrant():
     """Reset all Qdrant collections (delete and recreate)"""
     print("🔄 Resetting Qdrant collections...")
     
+    qdrant_client = get_qdrant_client()
+    
     # Delete all collections
-    success = qdrant_client.delete_collections()
+    success = await qdrant_client.delete_collections()
     if not success:
         print("❌ Failed to delete collections")
         return False
@@ -65,14 +70,14 @@ def reset_qdrant():
     print("✅ All collections deleted")
     
     # Recreate collections
-    return setup_qdrant()
+    return await setup_qdrant()
 
 def main():
     """Main function"""
     if len(sys.argv) > 1 and sys.argv[1] == "--reset":
-        success = reset_qdrant()
+        success = asyncio.run(reset_qdrant())
     else:
-        success = setup_qdrant()
+        success = asyncio.run(setup_qdrant())
     
     if success:
         print("\n🎉 Qdrant setup completed successfully!")